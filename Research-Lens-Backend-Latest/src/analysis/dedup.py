@@ -0,0 +1,154 @@
+import os
+import re
+import zlib
+import pickle
+import numpy as np
+
+DEDUP_INDEX_PATH = os.getenv("DEDUP_INDEX_PATH", "dedup_index.pkl")
+
+# 8 bands x 8 rows -> candidate pairs start around jaccard 0.77
+NUM_PERM = 64
+BANDS = 8
+PRIME = (1 << 31) - 1
+
+VERSION_RE = re.compile(r'v(\d+)$')
+
+
+def base_id(arxiv_id):
+    return VERSION_RE.sub('', arxiv_id)
+
+
+def version_of(arxiv_id):
+    m = VERSION_RE.search(arxiv_id)
+    return int(m.group(1)) if m else 0
+
+
+def shingles(txt, k=3):
+    words = re.findall(r'\w+', txt.lower())
+    if len(words) < k:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+class DedupIndex:
+    """MinHash/LSH over title+abstract word shingles plus an arXiv base id map.
+
+    Lookups only touch the LSH buckets of the incoming paper, so the cost per
+    paper does not grow with the corpus.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=NUM_PERM, bands=BANDS, seed=1):
+        rng = np.random.RandomState(seed)
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.a = rng.randint(1, PRIME, size=num_perm).astype(np.uint64)
+        self.b = rng.randint(0, PRIME, size=num_perm).astype(np.uint64)
+        self.buckets = [{} for _ in range(bands)]
+        self.sigs = {}
+        self.ids = {}   # base arxiv id -> (paper id, full arxiv id)
+        self.dups = {}  # flagged paper id -> paper id it duplicates
+        self.pids = set()
+        self.max_id = 0
+
+    def signature(self, txt):
+        sh = shingles(txt)
+        if not sh:
+            return None
+        hs = np.fromiter((zlib.crc32(x.encode()) for x in sh), dtype=np.uint64, count=len(sh))
+        return ((np.outer(self.a, hs) + self.b[:, None]) % PRIME).min(axis=1)
+
+    def _band_keys(self, sig):
+        r = self.rows
+        return [sig[i * r:(i + 1) * r].tobytes() for i in range(self.bands)]
+
+    def check(self, arxiv_id, txt):
+        """Returns (match, signature).
+
+        match is None, or a dict with kind 'version' (same base arXiv id) or
+        'near_duplicate' (estimated jaccard >= threshold) and the existing paper id.
+        """
+        sig = self.signature(txt)
+        known = self.ids.get(base_id(arxiv_id))
+        if known:
+            pid, stored = known
+            if stored == arxiv_id:
+                # plain re-scrape, the upsert handles it, keep earlier flags
+                if pid in self.dups:
+                    return {"kind": "near_duplicate", "paper_id": self.dups[pid], "similarity": None}, sig
+                return None, sig
+            return {"kind": "version", "paper_id": pid, "arxiv_id": stored,
+                    "newer": version_of(arxiv_id) >= version_of(stored)}, sig
+
+        if sig is None:
+            return None, sig
+
+        cands = set()
+        for band, key in zip(self.buckets, self._band_keys(sig)):
+            cands.update(band.get(key, ()))
+
+        best, best_sim = None, 0.0
+        for c in cands:
+            sim = float(np.mean(self.sigs[c] == sig))
+            if sim > best_sim:
+                best, best_sim = c, sim
+        if best is not None and best_sim >= self.threshold:
+            return {"kind": "near_duplicate", "paper_id": best, "similarity": best_sim}, sig
+        return None, sig
+
+    def add(self, pid, arxiv_id, sig, duplicate_of=None):
+        self.ids[base_id(arxiv_id)] = (pid, arxiv_id)
+        self.pids.add(pid)
+        self.max_id = max(self.max_id, pid)
+        if duplicate_of:
+            # known, but never a match target itself
+            self.dups[pid] = duplicate_of
+            return
+        if sig is None or pid in self.sigs:
+            return
+        self.sigs[pid] = sig
+        for band, key in zip(self.buckets, self._band_keys(sig)):
+            band.setdefault(key, []).append(pid)
+
+    def save(self, path=DEDUP_INDEX_PATH):
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def _index_rows(self, db, after=0):
+        n = 0
+        for chunk in db.stream_papers_for_dedup(after=after):
+            for r in chunk:
+                sig = self.signature(f"{r['title']} {r['abstract'] or ''}")
+                self.add(r['id'], r['arxiv_id'], sig, r['duplicate_of'])
+                n += 1
+        return n
+
+    @classmethod
+    def load_or_build(cls, db, path=DEDUP_INDEX_PATH):
+        """Load the saved index and check it against the database.
+
+        Papers inserted elsewhere (auto_task) are caught up by id; if the rows
+        up to the saved max id don't match (reset, restore, deletes) the index
+        is rebuilt, stale ids would send merges to rows that aren't there.
+        """
+        idx = None
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                idx = pickle.load(f)
+            # pickles from before max_id was tracked can't be verified
+            if getattr(idx, "max_id", None) is None or db.count_papers_upto(idx.max_id) != len(idx.pids):
+                print("Dedup index out of sync with the database, rebuilding")
+                idx = None
+            else:
+                n = idx._index_rows(db, after=idx.max_id)
+                if n:
+                    print(f"Dedup index caught up on {n} papers")
+                    idx.save(path)
+                return idx
+
+        idx = cls()
+        idx._index_rows(db)
+        idx.save(path)
+        return idx
@@ -0,0 +1,106 @@
+import re
+from bisect import bisect_right
+
+# tagged lexicons in priority order, the untagged one only adds score
+DEFAULT_LEXICONS = [
+    ("SOTA", {'sota': 6}),
+    ("PERFORMANCE", {'outperform': 5}),
+    ("NOVELTY", {'novel': 3}),
+    (None, {'achieve': 4, 'surpass': 5, 'improve': 3, 'accuracy': 3}),
+]
+
+NUMBER_BONUS = 2
+
+# cheap splitter, good enough for abstracts (no dependency parse needed)
+SENT_SPLIT = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9(\[])')
+NUMBER_RE = re.compile(r'\d+(?:%|\.\d)')
+
+
+class FindingsScorer:
+    """Scores abstract sentences against weighted lexicons in a single regex pass.
+
+    Matching keeps the old substring semantics: every term counts once per
+    sentence, wherever it shows up (e.g. 'improve' hits 'improvements').
+    """
+
+    def __init__(self, lexicons=None, number_bonus=NUMBER_BONUS):
+        self.lexicons = list(lexicons if lexicons is not None else DEFAULT_LEXICONS)
+        self.number_bonus = number_bonus
+
+        self.weights = {}
+        self.tags = {}
+        self.priority = {}
+        for i, (tag, terms) in enumerate(self.lexicons):
+            for term, w in terms.items():
+                term = term.lower()
+                self.weights[term] = self.weights.get(term, 0) + w
+                if tag and term not in self.tags:
+                    self.tags[term] = tag
+                    self.priority[term] = i
+
+        # longest first so a lookahead at one position grabs the longest term,
+        # shorter terms contained in it are added back via `implied`
+        terms = sorted(self.weights, key=len, reverse=True)
+        self.implied = {t: [o for o in terms if o in t] for t in terms}
+        alt = '|'.join(re.escape(t) for t in terms) or r'(?!x)x'
+        self.pattern = re.compile(f'(?=({alt}))')
+
+    def add_lexicon(self, tag, terms):
+        # user defined lexicons go after the built-in ones
+        return FindingsScorer(self.lexicons + [(tag, terms)], self.number_bonus)
+
+    def split_sentences(self, txt):
+        txt = txt.strip()
+        if not txt:
+            return []
+        return [s for s in SENT_SPLIT.split(txt) if s.strip()]
+
+    def score_batch(self, texts):
+        """Best finding for every text, all sentences scanned in one pass."""
+        sents, lowered, owner, starts = [], [], [], []
+        pos = 0
+        for i, t in enumerate(texts):
+            for s in self.split_sentences(t or ""):
+                # offsets from the lowered text, lower() can change the length ('İ' -> 'i̇')
+                low = s.lower()
+                sents.append(s)
+                lowered.append(low)
+                owner.append(i)
+                starts.append(pos)
+                pos += len(low) + 1
+
+        # newline never shows up in a term, so matches can't cross sentences
+        blob = '\n'.join(lowered)
+
+        hits = [set() for _ in sents]
+        for m in self.pattern.finditer(blob):
+            idx = bisect_right(starts, m.start()) - 1
+            hits[idx].update(self.implied[m.group(1)])
+
+        has_num = [False] * len(sents)
+        for m in NUMBER_RE.finditer(blob):
+            has_num[bisect_right(starts, m.start()) - 1] = True
+
+        out = [{"text": "", "score": 0, "type": "info"} for _ in texts]
+        last = {}
+        for j, s in enumerate(sents):
+            i = owner[j]
+            last[i] = s
+            score = sum(self.weights[k] for k in hits[j])
+            if has_num[j]:
+                score += self.number_bonus
+
+            if score > out[i]["score"]:
+                tagged = [k for k in hits[j] if k in self.tags]
+                tag = self.tags[min(tagged, key=self.priority.get)] if tagged else "info"
+                out[i] = {"text": s, "score": score, "type": tag}
+
+        # fallback to last sentence
+        for i, s in last.items():
+            if not out[i]["text"]:
+                out[i] = {"text": s, "score": 0, "type": "CONCLUSION"}
+
+        return out
+
+    def score(self, txt):
+        return self.score_batch([txt])[0]
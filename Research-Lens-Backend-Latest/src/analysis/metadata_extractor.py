@@ -1,9 +1,16 @@
 import spacy
 from collections import Counter
 import re
+from analysis.findings_scorer import FindingsScorer
+
+# bump when keyword/finding logic changes, stored rows get re-analyzed
+ANALYSIS_VERSION = 1
 
 class MetadataExtractor:
-    def __init__(self):
+    def __init__(self, lexicons=None):
+        # findings only need a sentence split, no spacy parse
+        self.scorer = FindingsScorer(lexicons)
+
         # Assuming the model is downloaded
         try:
             self.nlp = spacy.load('en_core_web_md')
@@ -11,8 +18,14 @@ class MetadataExtractor:
             self.nlp = spacy.load('en_core_web_sm')
 
     def extract_keywords(self, text, top_n=15):
-        doc = self.nlp(text)
-        
+        return self._keywords_from_doc(self.nlp(text), text, top_n)
+
+    def extract_keywords_batch(self, texts, top_n=15, batch_size=64):
+        # nlp.pipe batches the parse, much faster than one call per text
+        docs = self.nlp.pipe(texts, batch_size=batch_size)
+        return [self._keywords_from_doc(d, t, top_n) for d, t in zip(docs, texts)]
+
+    def _keywords_from_doc(self, doc, text, top_n):
         # Common phrases to ignore
         ignore = [
             'this paper', 'this work', 'our method', 'proposed method', 
@@ -59,45 +72,7 @@ class MetadataExtractor:
         return txt.strip()
     
     def extract_key_findings(self, txt):
-        doc = self.nlp(txt)
-        sents = list(doc.sents)
-        
-        res = ""
-        high_score = 0
-        tag = "info"
-        
-        # simple scoring system
-        keywords = {
-            'outperform': 5, 'achieve': 4, 'sota': 6, 'surpass': 5, 
-            'improve': 3, 'accuracy': 3, 'novel': 3
-        }
-        
-        for s in sents:
-            raw = s.text.lower()
-            score = 0
-            
-            for k, v in keywords.items():
-                if k in raw:
-                    score += v
-            
-            # extra points for numbers
-            if re.search(r'\d+%', raw) or re.search(r'\d+\.\d+', raw):
-                score += 2
+        return self.scorer.score(txt)
 
-            if score > high_score:
-                high_score = score
-                res = s.text
-                
-                if 'sota' in raw:
-                    tag = "SOTA"
-                elif 'outperform' in raw:
-                    tag = "PERFORMANCE"
-                elif 'novel' in raw:
-                    tag = "NOVELTY"
-        
-        # fallback to last sentence
-        if not res and sents:
-            res = sents[-1].text
-            tag = "CONCLUSION"
-            
-        return {"text": res, "score": high_score, "type": tag}
\ No newline at end of file
+    def extract_key_findings_batch(self, texts):
+        return self.scorer.score_batch(texts)
@@ -0,0 +1,144 @@
+import os
+import zlib
+import time
+import threading
+from datetime import datetime, timedelta, date
+
+import numpy as np
+
+SKETCH_DAYS = int(os.getenv("SKETCH_DAYS", "90"))
+SKETCH_REBUILD_SECONDS = int(os.getenv("SKETCH_REBUILD_SECONDS", "3600"))
+
+
+class CountMinSketch:
+    def __init__(self, width=4096, depth=4):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.rows = np.arange(depth)
+
+    def _cols(self, key):
+        b = key.encode()
+        # crc32 with a different start value per row
+        return [zlib.crc32(b, i * 0x9E3779B1 & 0xFFFFFFFF) % self.width for i in range(self.depth)]
+
+    def add(self, key, n=1):
+        self.table[self.rows, self._cols(key)] += n
+
+    def estimate(self, key):
+        return int(self.table[self.rows, self._cols(key)].min())
+
+    def merge(self, other):
+        self.table += other.table
+        return self
+
+
+class SpaceSaving:
+    """Keeps the k heaviest keys; counts may overestimate by at most the evicted minimum."""
+
+    def __init__(self, k=200):
+        self.k = k
+        self.counts = {}
+
+    def add(self, key, n=1):
+        if key in self.counts:
+            self.counts[key] += n
+        elif len(self.counts) < self.k:
+            self.counts[key] = n
+        else:
+            victim = min(self.counts, key=self.counts.get)
+            self.counts[key] = self.counts.pop(victim) + n
+
+
+class TrendingSketch:
+    """Per-day Count-Min + Space-Saving summaries of keyword rows.
+
+    A window is answered by taking the union of the heavy hitters of its day
+    buckets as candidates and ranking them by the merged Count-Min estimate,
+    so cost depends on days * k, not on the number of keyword rows.
+    """
+
+    def __init__(self, days=SKETCH_DAYS, k=200, width=4096, depth=4):
+        self.days = days
+        self.k = k
+        self.width = width
+        self.depth = depth
+        self.buckets = {}
+        self.ready = False
+        self._lock = threading.Lock()
+        self._rebuild = threading.Event()
+
+    def _bucket(self, day):
+        b = self.buckets.get(day)
+        if b is None:
+            b = self.buckets[day] = (CountMinSketch(self.width, self.depth), SpaceSaving(self.k))
+        return b
+
+    def add(self, day, keywords):
+        if isinstance(day, str):
+            day = date.fromisoformat(day[:10])
+        elif isinstance(day, datetime):
+            day = day.date()
+        with self._lock:
+            cms, ss = self._bucket(day)
+            for kw in keywords:
+                cms.add(kw)
+                ss.add(kw)
+
+    def add_counts(self, day, keyword, n):
+        with self._lock:
+            cms, ss = self._bucket(day)
+            cms.add(keyword, n)
+            ss.add(keyword, n)
+
+    def covers(self, days):
+        return self.ready and days <= self.days
+
+    def top(self, days, top_n=20):
+        # same window as the SQL (published_date >= now - days): a day counts if its midnight is inside
+        cutoff = datetime.now() - timedelta(days=days)
+        with self._lock:
+            parts = [b for d, b in self.buckets.items() if datetime.combine(d, datetime.min.time()) >= cutoff]
+            if not parts:
+                return []
+            merged = CountMinSketch(self.width, self.depth)
+            cands = set()
+            for cms, ss in parts:
+                merged.merge(cms)
+                cands.update(ss.counts)
+        ranked = sorted(((merged.estimate(k), k) for k in cands), key=lambda x: (-x[0], x[1]))
+        return [{"keyword": k, "count": c} for c, k in ranked[:top_n]]
+
+    def prune(self):
+        cutoff = (datetime.now() - timedelta(days=self.days + 1)).date()
+        with self._lock:
+            for d in [d for d in self.buckets if d < cutoff]:
+                del self.buckets[d]
+
+    def load(self, db):
+        fresh = TrendingSketch(self.days, self.k, self.width, self.depth)
+        for day, kw, n in db.get_keyword_day_counts(days=self.days):
+            fresh.add_counts(day, kw, n)
+        with self._lock:
+            self.buckets = fresh.buckets
+            self.ready = True
+
+    def request_rebuild(self):
+        self._rebuild.set()
+
+    def start(self, db, interval=SKETCH_REBUILD_SECONDS):
+        """Load in the background, then rebuild every `interval` seconds to drop drift
+        from re-analyzed papers (events only ever add)."""
+        def run():
+            while True:
+                try:
+                    t0 = time.time()
+                    self.load(db)
+                    print(f"Trending sketch loaded in {time.time() - t0:.1f}s")
+                except Exception as e:
+                    print(f"Trending sketch load failed: {e}")
+                self._rebuild.wait(interval)
+                self._rebuild.clear()
+                self.prune()
+
+        threading.Thread(target=run, daemon=True).start()
@@ -0,0 +1,62 @@
+import re
+from collections import defaultdict
+
+TOKEN_RE = re.compile(r'\w+')
+
+
+def tokens(txt):
+    return set(TOKEN_RE.findall((txt or "").lower()))
+
+
+class SubscriptionIndex:
+    """Inverted index over saved searches, so a batch of papers is matched in one pass.
+
+    Each search is filed under a single anchor (author, else category, else its
+    longest keyword token); a paper only verifies the searches whose anchor it
+    contains. Keywords match on whole words of title+abstract, categories
+    include cross-lists, authors compare case-insensitively.
+    """
+
+    def __init__(self, searches):
+        self.searches = {}
+        self.by_author = defaultdict(list)
+        self.by_category = defaultdict(list)
+        self.by_token = defaultdict(list)
+
+        for s in searches:
+            kw = tokens(s.get('keyword'))
+            if not (kw or s.get('category') or s.get('author')):
+                continue
+            s = dict(s, _tokens=kw)
+            self.searches[s['id']] = s
+            if s.get('author'):
+                self.by_author[s['author'].lower()].append(s['id'])
+            elif s.get('category'):
+                self.by_category[s['category']].append(s['id'])
+            else:
+                self.by_token[max(kw, key=len)].append(s['id'])
+
+    def match(self, papers):
+        """Yields (search, paper) pairs, papers need an 'id'."""
+        for p in papers:
+            toks = tokens(f"{p.get('title', '')} {p.get('abstract', '')}")
+            cats = set(p.get('categories') or []) | {p.get('primary_category')}
+            auths = {a.lower() for a in p.get('authors') or []}
+
+            cands = set()
+            for a in auths:
+                cands.update(self.by_author.get(a, ()))
+            for c in cats:
+                cands.update(self.by_category.get(c, ()))
+            for t in toks:
+                cands.update(self.by_token.get(t, ()))
+
+            for sid in cands:
+                s = self.searches[sid]
+                if s['_tokens'] and not s['_tokens'] <= toks:
+                    continue
+                if s.get('category') and s['category'] not in cats:
+                    continue
+                if s.get('author') and s['author'].lower() not in auths:
+                    continue
+                yield s, p
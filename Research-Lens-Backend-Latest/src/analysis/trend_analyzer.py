@@ -1,22 +1,54 @@
+import os
 import pandas as pd
+import pyarrow.parquet as pq
 from datetime import datetime, timedelta
+from sqlalchemy import text
+from database.parquet_export import PARTITIONING
 
 class TrendAnalyzer:
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, snapshot_dir=None):
         self.db = db_manager
-    
+        # when set, read the parquet snapshot instead of hitting postgres
+        self.snapshot_dir = snapshot_dir
+
+    def _read(self, name, columns, since=None, until=None):
+        filters = []
+        if since is not None:
+            # month filter prunes whole partition directories
+            filters += [('month', '>=', since.strftime('%Y-%m')), ('published_date', '>=', since)]
+        if until is not None:
+            filters.append(('published_date', '<', until))
+        tbl = pq.read_table(
+            os.path.join(self.snapshot_dir, name),
+            columns=columns,
+            filters=filters or None,
+            partitioning=PARTITIONING,
+            memory_map=True
+        )
+        return tbl.to_pandas()
+
+    def _snapshot_keyword_counts(self, since, until=None):
+        df = self._read('keywords', ['keyword', 'published_date'], since, until)
+        return df['keyword'].astype(str).value_counts()
+
     def analyze_keyword_trends(self, days=30):
-        conn = self.db.engine.connect()
+        if self.snapshot_dir:
+            df = self._read('keywords', ['keyword', 'published_date'], datetime.now() - timedelta(days=days))
+            df['keyword'] = df['keyword'].astype(str)
+            df['date'] = df['published_date'].dt.date
+            out = df.groupby(['keyword', 'date']).size().reset_index(name='count')
+            return out.sort_values(['date', 'count'], ascending=[True, False]).reset_index(drop=True)
+
+        conn = self.db.read_engine().connect()
         try:
             query = """
                 SELECT 
                     k.keyword,
-                    DATE(p.published_date) as date,
+                    DATE(k.published_date) as date,
                     COUNT(*) as count
                 FROM keywords k
-                JOIN papers p ON k.paper_id = p.id
-                WHERE p.published_date >= NOW() - INTERVAL '%s days'
-                GROUP BY k.keyword, DATE(p.published_date)
+                WHERE k.published_date >= NOW() - INTERVAL '%s days'
+                GROUP BY k.keyword, DATE(k.published_date)
                 ORDER BY date, count DESC
             """
             return pd.read_sql_query(query % days, conn)
@@ -24,7 +56,12 @@ class TrendAnalyzer:
             conn.close()
     
     def get_category_distribution(self):
-        conn = self.db.engine.connect()
+        if self.snapshot_dir:
+            df = self._read('papers', ['category'])
+            out = df['category'].astype(str).value_counts().rename_axis('primary_category')
+            return out.reset_index(name='count')
+
+        conn = self.db.read_engine().connect()
         try:
             query = """
                 SELECT primary_category, COUNT(*) as count
@@ -37,7 +74,12 @@ class TrendAnalyzer:
             conn.close()
     
     def get_papers_per_day(self, days=30):
-        conn = self.db.engine.connect()
+        if self.snapshot_dir:
+            df = self._read('papers', ['published_date'], datetime.now() - timedelta(days=days))
+            df['date'] = df['published_date'].dt.date
+            return df.groupby('date').size().reset_index(name='count')
+
+        conn = self.db.read_engine().connect()
         try:
             query = """
                 SELECT 
@@ -53,9 +95,16 @@ class TrendAnalyzer:
             conn.close()
     
     def detect_emerging_topics(self, window=7, threshold=5):
+        if self.snapshot_dir:
+            now = datetime.now()
+            cur = self._snapshot_keyword_counts(now - timedelta(days=window)).head(100)
+            prev = self._snapshot_keyword_counts(now - timedelta(days=window * 2), now - timedelta(days=window))
+            current_data = [{"keyword": k, "count": int(c)} for k, c in cur.items()]
+            return self._emerging(current_data, prev.to_dict(), threshold)
+
         current_data = self.db.get_trending_topics(days=window, top_n=100)
         
-        s = self.db.get_session()
+        s = self.db.get_read_session()
         try:
             # Manual query for previous period comparison
             # Postgres syntax: NOW() - INTERVAL 'X days'
@@ -64,37 +113,38 @@ class TrendAnalyzer:
             q = f"""
                 SELECT k.keyword, COUNT(*) 
                 FROM keywords k
-                JOIN papers p ON k.paper_id = p.id
-                WHERE p.published_date >= NOW() - INTERVAL '{prev_start} days'
-                  AND p.published_date < NOW() - INTERVAL '{window} days'
+                WHERE k.published_date >= NOW() - INTERVAL '{prev_start} days'
+                  AND k.published_date < NOW() - INTERVAL '{window} days'
                 GROUP BY k.keyword
             """
             
             res = s.execute(text(q))
             prev_counts = {row[0]: row[1] for row in res}
+            return self._emerging(current_data, prev_counts, threshold)
             
-            emerging = []
-            
-            for item in current_data:
-                kw = item['keyword']
-                curr_count = item['count']
-                prev_count = prev_counts.get(kw, 0)
-                
-                rate = 0.0
-                if prev_count == 0 and curr_count >= threshold:
-                    rate = 100.0
-                elif prev_count > 0:
-                    rate = (curr_count - prev_count) / prev_count
-                
-                if rate > 0.5:
-                    emerging.append({
-                        'keyword': kw,
-                        'current_count': curr_count,
-                        'previous_count': prev_count,
-                        'growth_rate': rate
-                    })
+        finally:
+            s.close()
+
+    def _emerging(self, current_data, prev_counts, threshold):
+        emerging = []
+        
+        for item in current_data:
+            kw = item['keyword']
+            curr_count = item['count']
+            prev_count = prev_counts.get(kw, 0)
             
-            return sorted(emerging, key=lambda x: x['growth_rate'], reverse=True)
+            rate = 0.0
+            if prev_count == 0 and curr_count >= threshold:
+                rate = 100.0
+            elif prev_count > 0:
+                rate = (curr_count - prev_count) / prev_count
             
-        finally:
-            s.close()
\ No newline at end of file
+            if rate > 0.5:
+                emerging.append({
+                    'keyword': kw,
+                    'current_count': curr_count,
+                    'previous_count': prev_count,
+                    'growth_rate': rate
+                })
+        
+        return sorted(emerging, key=lambda x: x['growth_rate'], reverse=True)
\ No newline at end of file
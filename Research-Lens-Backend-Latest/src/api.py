@@ -1,13 +1,54 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, StreamingResponse, ORJSONResponse
+from pydantic import BaseModel
 import os
+import json
+import asyncio
 import uvicorn
-import requests
-from database.db_manager import DatabaseManager
+from sqlalchemy import func
+from database.db_manager import DatabaseManager, REPLICA_MAX_LAG
+from database.events import EventHub, publish
+from database.cache import PaperCache
+from scraper.http_client import HttpClient, HttpError
+from analysis.sketches import TrendingSketch
+from database.analytics_snapshot import AnalyticsSnapshot
 
-app = FastAPI()
+class GZipExceptStream(GZipMiddleware):
+    # gzip would hold back server-sent events until its buffer fills
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == "/api/stream":
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+app = FastAPI(default_response_class=ORJSONResponse)
 db = DatabaseManager()
+hub = EventHub(db)
+paper_cache = PaperCache(dirty_window=REPLICA_MAX_LAG)
+http = HttpClient()
+trending = TrendingSketch()
+snapshot = AnalyticsSnapshot()
+
+# trending windows kept in the snapshot, top_n up to SNAPSHOT_TOP_N is sliced from them
+SNAPSHOT_DAYS = (1, 7, 30)
+SNAPSHOT_TOP_N = 20
+
+# ingest and downloads (from any process) announce changed paper ids
+hub.on("papers", lambda d: paper_cache.invalidate(*d["ids"]))
+
+# the sketch only lives in the snapshot leader, other workers read its
+# trending lists from the snapshot and fall back to SQL
+def add_keywords(d):
+    if not snapshot.leader:
+        return
+    for p in d["papers"]:
+        if p["date"]:
+            trending.add(p["date"], p["keywords"])
+
+hub.on("keywords", add_keywords)
+hub.on("keywords_replaced", lambda d: trending.request_rebuild())
 
 app.add_middleware(
     CORSMiddleware,
@@ -16,101 +57,111 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(GZipExceptStream, minimum_size=1000)
+
+def build_snapshot():
+    def top(days):
+        if trending.covers(days):
+            return trending.top(days, SNAPSHOT_TOP_N)
+        return db.get_trending_topics(days=days, top_n=SNAPSHOT_TOP_N)
+
+    return {
+        "stats": db.get_dashboard_counts(),
+        "charts": db.get_chart_analytics(),
+        "findings": db.get_dashboard_findings(limit=10),
+        "trending": {str(d): top(d) for d in SNAPSHOT_DAYS}
+    }
+
+# runs in every worker after the fork (serve.py preloads the app), never in the gunicorn master
+@app.on_event("startup")
+def start_events():
+    hub.start()
+    snapshot.start(build_snapshot, on_leader=lambda: trending.start(db))
 
 @app.get("/")
 def index():
     return {"status": "ok"}
 
+def get_details(ids):
+    found, missing = paper_cache.get_many(ids)
+    if missing:
+        # just-changed papers come from the primary, the replica may still have the old row
+        dirty = paper_cache.dirty(missing)
+        rows = db.get_paper_details([i for i in missing if i not in dirty])
+        rows.update(db.get_paper_details(list(dirty), primary=True))
+        for pid, d in rows.items():
+            paper_cache.put(pid, d)
+            found[pid] = d
+    return [found[i] for i in ids if i in found]
+
 @app.get("/api/papers")
-def get_papers(keyword: str = None, category: str = None, start_date: str = None, limit: int = 50):
-    return db.search_papers(keyword=keyword, category=category, start_date=start_date, limit=limit)
+def get_papers(keyword: str = None, category: str = None, start_date: str = None, limit: int = 50, ids: str = None,
+               author: str = None, any_category: str = None, full_abstract: bool = False):
+    # hot paths return ORJSONResponse directly, skipping fastapi's jsonable_encoder pass
+    # ?ids=1,2,3 -> cached detail records, used for list hovers
+    if ids:
+        id_list = [int(x) for x in ids.split(',') if x.strip().isdigit()]
+        return ORJSONResponse(get_details(id_list[:limit]))
+    # snippets by default, full text via ?full_abstract=true or /api/papers/{pid}/abstract
+    return ORJSONResponse(db.search_papers(keyword=keyword, category=category, start_date=start_date, limit=limit,
+                                           author=author, any_category=any_category, full_abstract=full_abstract))
+
+# must be registered before /api/papers/{pid}
+@app.get("/api/papers/facets")
+def get_facets(keyword: str = None, category: str = None, start_date: str = None, author: str = None,
+               any_category: str = None, top_n: int = 10):
+    return db.get_facets(keyword=keyword, category=category, start_date=start_date, author=author,
+                         any_category=any_category, top_n=top_n)
 
 @app.get("/api/papers/{pid}")
 def get_paper(pid: int):
-    s = db.get_session()
-    try:
-        # Lazy import to avoid circular stuff
-        from database.db_manager import Paper
-        
-        p = s.query(Paper).filter(Paper.id == pid).first()
-        if not p:
-            raise HTTPException(status_code=404, detail="Not found")
-        
-        res = {
-            "id": p.id,
-            "arxiv_id": p.arxiv_id,
-            "title": p.title,
-            "abstract": p.abstract,
-            "authors": p.authors,
-            "categories": p.categories,
-            "primary_category": p.primary_category,
-            "published_date": p.published_date,
-            "pdf_url": p.pdf_url,
-            "is_downloaded": bool(p.pdf_path)
-        }
-
-        res['keywords'] = [{"name": k.keyword, "count": k.frequency} for k in p.keywords]
+    res = get_details([pid])
+    if not res:
+        raise HTTPException(status_code=404, detail="Not found")
+    return ORJSONResponse(res[0])
+
+@app.get("/api/papers/{pid}/abstract")
+def get_abstract(pid: int):
+    res = get_details([pid])
+    if not res:
+        raise HTTPException(status_code=404, detail="Not found")
+    return {"id": pid, "abstract": res[0]["abstract"]}
+
+def format_stats(c):
+    return [
+        {
+            "label": "RECENT INFLUX",
+            "value": f"+{c['recent']}",
+            "description": "LAST 7 DAYS",
+            "intent": "neutral",
+            "icon": "activity",
+            "tag": "active"
+        },
+        {
+            "label": "PAPERS PARSED",
+            "value": f"{c['papers']}",
+            "description": "TOTAL DATABASE",
+            "intent": "neutral",
+            "icon": "atom",
+            "direction": "up"
+        },
+        {
+            "label": "HIGH IMPACT",
+            "value": f"{c['high_impact']}",
+            "description": "SOTA & NOVEL FINDINGS",
+            "intent": "positive",
+            "icon": "star",
+            "direction": "up"
+        },
         
-        if p.findings:
-            f = p.findings[0]
-            res['finding'] = {
-                "finding_text": f.finding_text,
-                "finding_type": f.finding_type,
-                "score": f.score
-            }
-        else:
-            res['finding'] = None
-            
-        return res
-    finally:
-        s.close()
+    ]
 
 @app.get("/api/dashboard/stats")
 def stats():
-    s = db.get_session()
-    try:
-        from database.db_manager import Paper, KeyFinding
-        from datetime import datetime, timedelta
-        
-        cnt = s.query(Paper).count()
-        hi = s.query(KeyFinding).filter(KeyFinding.score >= 5).count()
-        
-        d7 = datetime.now() - timedelta(days=7)
-        recent = s.query(Paper).filter(Paper.published_date >= d7).count()
-
-        return [
-            {
-                "label": "RECENT INFLUX",
-                "value": f"+{recent}",
-                "description": "LAST 7 DAYS",
-                "intent": "neutral",
-                "icon": "activity",
-                "tag": "active"
-            },
-            {
-                "label": "PAPERS PARSED",
-                "value": f"{cnt}",
-                "description": "TOTAL DATABASE",
-                "intent": "neutral",
-                "icon": "atom",
-                "direction": "up"
-            },
-            {
-                "label": "HIGH IMPACT",
-                "value": f"{hi}",
-                "description": "SOTA & NOVEL FINDINGS",
-                "intent": "positive",
-                "icon": "star",
-                "direction": "up"
-            },
-            
-        ]
-    finally:
-        s.close()
+    # dashboard aggregates come from the shared snapshot, computed live only if it's missing or stale
+    return format_stats(snapshot.section("stats") or db.get_dashboard_counts())
 
-@app.get("/api/dashboard/trending-topics")
-def trends(days: int = 7, top_n: int = 5):
-    data = db.get_trending_topics(days=days, top_n=top_n)
+def format_topics(data):
     out = []
     for i, r in enumerate(data):
         out.append({
@@ -123,9 +174,90 @@ def trends(days: int = 7, top_n: int = 5):
         })
     return out
 
+@app.get("/api/dashboard/trending-topics")
+def trends(days: int = 7, top_n: int = 5, mode: str = "sketch"):
+    # sketch: merged day buckets, exact: GROUP BY, verify: both side by side
+    if mode == "sketch" and days in SNAPSHOT_DAYS and top_n <= SNAPSHOT_TOP_N:
+        cached = snapshot.section("trending")
+        if cached:
+            return format_topics(cached[str(days)][:top_n])
+
+    if mode == "exact" or not trending.covers(days):
+        return format_topics(db.get_trending_topics(days=days, top_n=top_n))
+
+    approx = trending.top(days, top_n)
+    if mode != "verify":
+        return format_topics(approx)
+
+    exact = db.get_trending_topics(days=days, top_n=top_n)
+    counts = db.get_keyword_counts([r["keyword"] for r in approx], days)
+    return {
+        "sketch": [dict(r, exact=counts.get(r["keyword"], 0)) for r in approx],
+        "exact": exact,
+        "overlap": len({r["keyword"] for r in approx} & {r["keyword"] for r in exact})
+    }
+
+@app.get("/api/stream")
+async def stream(request: Request):
+    """Server-sent events: finding, stats (increments) and trending."""
+    q = hub.subscribe()
+
+    async def gen():
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    ev = await asyncio.wait_for(q.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    # keep proxies from closing idle connections
+                    yield ": ping\n\n"
+                    continue
+
+                kind, data = ev["kind"], ev["data"]
+                if kind == "trending":
+                    data = format_topics(data["topics"])
+                elif kind not in ("finding", "stats"):
+                    continue
+                yield f"event: {kind}\ndata: {json.dumps(data)}\n\n"
+        finally:
+            hub.unsubscribe(q)
+
+    return StreamingResponse(gen(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+class SavedSearchIn(BaseModel):
+    keyword: str = None
+    category: str = None
+    author: str = None
+
+@app.post("/api/users/{user_id}/saved-searches")
+def add_saved_search(user_id: str, body: SavedSearchIn):
+    if not (body.keyword or body.category or body.author):
+        raise HTTPException(status_code=400, detail="keyword, category or author required")
+    return db.add_saved_search(user_id, keyword=body.keyword, category=body.category, author=body.author)
+
+@app.get("/api/users/{user_id}/saved-searches")
+def list_saved_searches(user_id: str):
+    return db.get_saved_searches(user_id)
+
+@app.delete("/api/users/{user_id}/saved-searches/{sid}")
+def delete_saved_search(user_id: str, sid: int):
+    if not db.delete_saved_search(user_id, sid):
+        raise HTTPException(status_code=404, detail="Not found")
+    return {"status": "success"}
+
+@app.get("/api/users/{user_id}/notifications")
+def notifications(user_id: str, limit: int = 20, unread_only: bool = False):
+    # matches are written at ingest, this is just a read of the user's queue
+    return db.get_notifications(user_id, limit=limit, unread_only=unread_only)
+
+@app.post("/api/users/{user_id}/notifications/read")
+def read_notifications(user_id: str, up_to_id: int = None):
+    return {"updated": db.mark_notifications_read(user_id, up_to_id)}
+
 @app.get("/api/dashboard/findings")
 def findings():
-    return db.get_dashboard_findings(limit=10)
+    return snapshot.section("findings") or db.get_dashboard_findings(limit=10)
 
 @app.post("/api/papers/{pid}/download")
 def download(pid: int):
@@ -144,14 +276,24 @@ def download(pid: int):
             
         path = os.path.join("downloads", fname)
         
-        r = requests.get(url)
-        with open(path, 'wb') as f:
-            f.write(r.content)
+        if not http.download(url, path):
+            raise HTTPException(status_code=502, detail="PDF download failed")
             
         p.pdf_path = path
+        p.changed_at = func.now()
         s.commit()
+
+        paper_cache.invalidate(pid)
+        publish(db, "papers", {"ids": [pid]})
             
         return {"status": "success", "path": path}
+    except HTTPException:
+        s.rollback()
+        raise
+    except HttpError as e:
+        # arXiv kept failing after retries
+        s.rollback()
+        raise HTTPException(status_code=502, detail=str(e))
     except Exception as e:
         s.rollback()
         raise HTTPException(status_code=500, detail=str(e))
@@ -174,7 +316,7 @@ def view_pdf(pid: int):
 
 @app.get("/api/analytics/charts")
 def charts():
-    return db.get_chart_analytics()
+    return snapshot.section("charts") or db.get_chart_analytics()
 
 @app.get("/api/analytics/keyword-trends")
 def kw_trends(keywords: str, days: int = 30):
@@ -0,0 +1,105 @@
+import os
+import mmap
+import time
+import fcntl
+import tempfile
+import threading
+from decimal import Decimal
+from datetime import date
+
+import orjson
+
+# /dev/shm keeps the file in memory, every worker maps the same pages
+_SHM = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+SNAPSHOT_PATH = os.getenv("ANALYTICS_SNAPSHOT_PATH", os.path.join(_SHM, "research_lens_analytics.json"))
+SNAPSHOT_SECONDS = int(os.getenv("ANALYTICS_SNAPSHOT_SECONDS", "30"))
+
+
+def _default(o):
+    if isinstance(o, Decimal):
+        return float(o)
+    if isinstance(o, date):
+        return o.isoformat()
+    raise TypeError
+
+
+class AnalyticsSnapshot:
+    """Dashboard aggregates built by one process and read by all workers.
+
+    Every worker runs start(); the one holding the flock on <path>.lock
+    rebuilds the snapshot each `interval` seconds and swaps it in with
+    os.replace, the others keep retrying the lock so a new leader takes
+    over if it dies. Readers re-map the file only when its inode changes,
+    a snapshot is never modified once written.
+    """
+
+    def __init__(self, path=SNAPSHOT_PATH, interval=SNAPSHOT_SECONDS):
+        self.path = path
+        self.interval = interval
+        # older than this and callers compute live instead
+        self.max_age = interval * 3
+        self.leader = False
+        self._key = None
+        self._data = None
+        self._lock = threading.Lock()
+
+    def write(self, data):
+        data = dict(data, built_at=time.time())
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(orjson.dumps(data, default=_default))
+        os.replace(tmp, self.path)
+
+    def get(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        key = (st.st_ino, st.st_mtime_ns)
+        with self._lock:
+            if key != self._key:
+                try:
+                    with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                            memoryview(mm) as view:
+                        self._data = orjson.loads(view)
+                    self._key = key
+                except (OSError, ValueError) as e:
+                    print(f"Analytics snapshot unreadable: {e}")
+                    return None
+            data = self._data
+        if time.time() - data["built_at"] > self.max_age:
+            return None
+        return data
+
+    def section(self, name):
+        data = self.get()
+        return data.get(name) if data else None
+
+    def start(self, build, on_leader=None):
+        """`build()` returns the snapshot dict, only called in the leader.
+
+        `on_leader()` runs once when this process takes the lock, for work
+        only the leader should do (e.g. loading the trending sketch).
+        """
+        def run():
+            lock = open(self.path + ".lock", "w")
+            while not self.leader:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    self.leader = True
+                except BlockingIOError:
+                    time.sleep(self.interval)
+            print(f"Analytics snapshot leader (pid {os.getpid()})")
+            if on_leader:
+                on_leader()
+
+            while True:
+                try:
+                    t0 = time.time()
+                    self.write(build())
+                    print(f"Analytics snapshot built in {time.time() - t0:.1f}s")
+                except Exception as e:
+                    print(f"Analytics snapshot build failed: {e}")
+                time.sleep(self.interval)
+
+        threading.Thread(target=run, daemon=True).start()
@@ -0,0 +1,59 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+class PaperCache:
+    """Small LRU for serialized paper details.
+
+    Entries are dropped on ingest/download events, the ttl only bounds how
+    stale an entry can get if an event is missed. Invalidated ids stay
+    `dirty` for `dirty_window` seconds so callers can refill them from the
+    primary, a lagging replica would hand back the old row.
+    """
+
+    def __init__(self, max_size=5000, ttl=300, dirty_window=30):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.dirty_window = dirty_window
+        self._data = OrderedDict()
+        self._dirty = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, ids):
+        now = time.time()
+        found, missing = {}, []
+        with self._lock:
+            for i in ids:
+                hit = self._data.get(i)
+                if hit and now - hit[0] < self.ttl:
+                    self._data.move_to_end(i)
+                    found[i] = hit[1]
+                else:
+                    missing.append(i)
+        return found, missing
+
+    def get(self, pid):
+        found, _ = self.get_many([pid])
+        return found.get(pid)
+
+    def put(self, pid, value):
+        with self._lock:
+            self._data[pid] = (time.time(), value)
+            self._data.move_to_end(pid)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def invalidate(self, *ids):
+        now = time.time()
+        with self._lock:
+            for i in ids:
+                self._data.pop(i, None)
+                self._dirty[i] = now
+
+    def dirty(self, ids):
+        now = time.time()
+        with self._lock:
+            for i in [i for i, t in self._dirty.items() if now - t > self.dirty_window]:
+                del self._dirty[i]
+            return {i for i in ids if i in self._dirty}
@@ -0,0 +1,150 @@
+import json
+import time
+import select
+import asyncio
+import threading
+from sqlalchemy import text
+
+# postgres LISTEN/NOTIFY channel shared by ingest and the api
+CHANNEL = "research_lens_events"
+
+# what the dashboard shows, see /api/dashboard/trending-topics
+TRENDING_DAYS = 7
+TRENDING_TOP_N = 5
+
+# NOTIFY payloads are capped at 8000 bytes
+MAX_MESSAGE = 1000
+IDS_PER_EVENT = 500
+# keyword batches are flushed by encoded size, keeping headroom for the envelope
+NOTIFY_BUDGET = 7500
+MAX_KEYWORD_BYTES = 200
+
+
+def publish(db, kind, payload):
+    msg = json.dumps({"kind": kind, "data": payload}, default=str)
+    with db.engine.begin() as conn:
+        conn.execute(text("SELECT pg_notify(:ch, :msg)"), {"ch": CHANNEL, "msg": msg})
+
+
+def _keyword_entry(d, kws):
+    # oversized keywords (long chunks, \uXXXX escapes) are dropped, not sent
+    kws = [k for k in kws if len(json.dumps(k)) <= MAX_KEYWORD_BYTES]
+    entry = {"date": d.date().isoformat() if d else None, "keywords": kws}
+    size = len(json.dumps(entry))
+    while size > NOTIFY_BUDGET and kws:
+        kws.pop()
+        size = len(json.dumps(entry))
+    return entry, size
+
+
+def publish_ingest(db, pids, since, prev_top):
+    """Push only what changed after an ingest batch: new findings, counters, trending ranks."""
+    for i in range(0, len(pids), IDS_PER_EVENT):
+        publish(db, "papers", {"ids": pids[i:i + IDS_PER_EVENT]})
+
+    # keyword rows of new papers feed the api's trending sketch
+    batch, size = [], 0
+    for d, kws in db.get_new_keywords(pids, since):
+        entry, n = _keyword_entry(d, kws)
+        # +2 for the ", " separator
+        if batch and size + n + 2 > NOTIFY_BUDGET:
+            publish(db, "keywords", {"papers": batch})
+            batch, size = [], 0
+        batch.append(entry)
+        size += n + 2
+    if batch:
+        publish(db, "keywords", {"papers": batch})
+
+    findings, counts = db.get_ingest_delta(pids, since)
+    for f in findings:
+        f["message"] = (f["message"] or "")[:MAX_MESSAGE]
+        publish(db, "finding", f)
+
+    if any(counts.values()):
+        publish(db, "stats", counts)
+
+    top = db.get_trending_topics(days=TRENDING_DAYS, top_n=TRENDING_TOP_N, primary=True)
+    if top != prev_top:
+        publish(db, "trending", {"days": TRENDING_DAYS, "topics": top})
+
+
+class EventHub:
+    """Listens on the notify channel in a thread and fans events out.
+
+    Handlers registered with on() run in the listener thread, SSE clients get
+    events through per-connection asyncio queues.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.handlers = []
+        self.subscribers = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def on(self, kind, fn):
+        self.handlers.append((kind, fn))
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def subscribe(self, maxsize=100):
+        q = asyncio.Queue(maxsize=maxsize)
+        with self._lock:
+            self.subscribers[q] = asyncio.get_running_loop()
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            self.subscribers.pop(q, None)
+
+    @staticmethod
+    def _put(q, event):
+        # slow client, drop the oldest event instead of blocking everyone
+        if q.full():
+            q.get_nowait()
+        q.put_nowait(event)
+
+    def _dispatch(self, event):
+        for kind, fn in self.handlers:
+            if kind == event["kind"]:
+                try:
+                    fn(event["data"])
+                except Exception as e:
+                    print(f"Event handler error: {e}")
+
+        with self._lock:
+            subs = list(self.subscribers.items())
+        for q, loop in subs:
+            loop.call_soon_threadsafe(self._put, q, event)
+
+    def _run(self):
+        while True:
+            conn = None
+            try:
+                # own connection outside the pool, NOTIFY only works on the primary
+                conn = self.db.engine.raw_connection()
+                conn.detach()
+                raw = conn.driver_connection
+                raw.set_isolation_level(0)
+                cur = raw.cursor()
+                cur.execute(f"LISTEN {CHANNEL}")
+
+                while True:
+                    if select.select([raw], [], [], 30) == ([], [], []):
+                        continue
+                    raw.poll()
+                    while raw.notifies:
+                        n = raw.notifies.pop(0)
+                        self._dispatch(json.loads(n.payload))
+            except Exception as e:
+                print(f"Event listener error: {e}, reconnecting...")
+                time.sleep(5)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
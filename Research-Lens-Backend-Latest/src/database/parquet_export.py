@@ -0,0 +1,170 @@
+import os
+import json
+import shutil
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from sqlalchemy import text
+
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "snapshot")
+
+# hive style month=YYYY-MM/category=cs.AI directories
+PARTITIONING = ds.partitioning(
+    pa.schema([("month", pa.string()), ("category", pa.string())]),
+    flavor="hive"
+)
+
+# low cardinality columns, stored dictionary encoded
+CATEGORICAL = ["primary_category", "keyword", "finding_type"]
+
+_DICT = pa.dictionary(pa.int32(), pa.string())
+_PARTS = [("month", pa.string()), ("category", pa.string())]
+
+# fixed per table, inferring from each appended chunk gives null-typed columns
+# (e.g. an all-None pdf_path) that later appends can't be read together with
+SCHEMAS = {
+    "papers": pa.schema([
+        ("id", pa.int64()), ("arxiv_id", pa.string()), ("title", pa.string()), ("abstract", pa.string()),
+        ("authors", pa.list_(pa.string())), ("categories", pa.list_(pa.string())),
+        ("primary_category", _DICT), ("published_date", pa.timestamp("us")),
+        ("updated_date", pa.timestamp("us")), ("pdf_url", pa.string()), ("pdf_path", pa.string()),
+    ] + _PARTS),
+    "keywords": pa.schema([
+        ("paper_id", pa.int64()), ("keyword", _DICT), ("frequency", pa.int64()),
+        ("published_date", pa.timestamp("us")), ("primary_category", _DICT),
+    ] + _PARTS),
+    "findings": pa.schema([
+        ("paper_id", pa.int64()), ("finding_text", pa.string()), ("finding_type", _DICT), ("score", pa.int64()),
+        ("published_date", pa.timestamp("us")), ("primary_category", _DICT),
+    ] + _PARTS),
+}
+
+# month/category directory of a paper, same rules as _to_table
+PART_SQL = """(COALESCE(TO_CHAR(p.published_date, 'YYYY-MM'), 'unknown') || '/' ||
+               COALESCE(NULLIF(p.primary_category, ''), 'unknown'))"""
+
+# new papers, plus every paper of the partitions being rewritten
+SELECTED = f"p.id <= :hi AND (p.id > :lo OR {PART_SQL} = ANY(:parts))"
+
+QUERIES = {
+    "papers": f"""
+        SELECT id, arxiv_id, title, abstract, authors, categories, primary_category,
+               published_date, updated_date, pdf_url, pdf_path
+        FROM papers p
+        WHERE {SELECTED}
+    """,
+    "keywords": f"""
+        SELECT k.paper_id, k.keyword, k.frequency, p.published_date, p.primary_category
+        FROM keywords k
+        JOIN papers p ON k.paper_id = p.id
+        WHERE {SELECTED}
+    """,
+    "findings": f"""
+        SELECT f.paper_id, f.finding_text, f.finding_type, f.score, p.published_date, p.primary_category
+        FROM key_findings f
+        JOIN papers p ON f.paper_id = p.id
+        WHERE {SELECTED}
+    """,
+}
+
+# writers stamp changed_at with their transaction start, one that was still
+# open when the last export ran is caught by looking back a little further
+CHANGE_OVERLAP = timedelta(minutes=1)
+
+
+class ParquetExporter:
+    """Writes papers/keywords/findings to partitioned Parquet, appending new papers and rewriting changed partitions."""
+
+    def __init__(self, db_manager, out_dir=SNAPSHOT_DIR, chunk_size=50000):
+        self.db = db_manager
+        self.out_dir = out_dir
+        self.chunk_size = chunk_size
+        self.state_path = os.path.join(out_dir, "_state.json")
+
+    def _load_state(self):
+        if not os.path.exists(self.state_path):
+            return {"last_paper_id": 0}
+        with open(self.state_path) as f:
+            return json.load(f)
+
+    def _save_state(self, state):
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.state_path)
+
+    def _to_table(self, name, df):
+        df["month"] = df["published_date"].dt.strftime("%Y-%m").fillna("unknown")
+        df["category"] = df["primary_category"].replace("", None).fillna("unknown")
+        for c in CATEGORICAL:
+            if c in df:
+                df[c] = df[c].astype("category")
+        return pa.Table.from_pandas(df, schema=SCHEMAS[name], preserve_index=False)
+
+    def _changed_partitions(self, conn, lo, since):
+        """month/category pairs holding exported papers that changed after `since`."""
+        if not since or not lo:
+            return []
+        return conn.execute(text(f"""
+            SELECT DISTINCT {PART_SQL} FROM papers p
+            WHERE p.id <= :lo AND p.changed_at >= :since
+        """), {"lo": lo, "since": since}).scalars().all()
+
+    def export(self, full=False):
+        """Append papers added since the last run, or rewrite everything with full=True.
+
+        Partitions holding already exported papers that changed since the last
+        run (re-analysis, re-scrape, new version, downloaded PDF) are rewritten
+        as a whole, so the files follow papers.changed_at.
+        """
+        if full:
+            for name in QUERIES:
+                shutil.rmtree(os.path.join(self.out_dir, name), ignore_errors=True)
+        os.makedirs(self.out_dir, exist_ok=True)
+
+        state = {"last_paper_id": 0} if full else self._load_state()
+        lo = state["last_paper_id"]
+
+        # primary only: a lagging replica can show a paper before its keyword rows,
+        # and the watermark would then skip those rows for good
+        with self.db.engine.connect() as conn:
+            started = conn.execute(text("SELECT NOW()::timestamp")).scalar()
+            hi = conn.execute(text("SELECT COALESCE(MAX(id), 0) FROM papers")).scalar()
+            since = state.get("changed_since")
+            parts = self._changed_partitions(conn, lo, since and datetime.fromisoformat(since))
+            if hi <= lo and not parts:
+                print("Snapshot up to date.")
+                return 0
+
+            # state is saved last, a crash in between finds the same partitions next run
+            for part in parts:
+                month, category = part.split('/', 1)
+                for name in QUERIES:
+                    shutil.rmtree(os.path.join(self.out_dir, name, f"month={month}", f"category={category}"),
+                                  ignore_errors=True)
+
+            stamp = datetime.now().strftime("%Y%m%d%H%M%S")
+            for name, q in QUERIES.items():
+                chunks = pd.read_sql_query(text(q), conn, params={"lo": lo, "hi": hi, "parts": parts},
+                                           chunksize=self.chunk_size)
+                for i, df in enumerate(chunks):
+                    if df.empty:
+                        continue
+                    ds.write_dataset(
+                        self._to_table(name, df),
+                        os.path.join(self.out_dir, name),
+                        format="parquet",
+                        schema=SCHEMAS[name],
+                        partitioning=PARTITIONING,
+                        basename_template=f"part-{stamp}-{i}-{{i}}.parquet",
+                        existing_data_behavior="overwrite_or_ignore"
+                    )
+
+        state["last_paper_id"] = max(hi, lo)
+        state["changed_since"] = (started - CHANGE_OVERLAP).isoformat()
+        state["exported_at"] = datetime.now().isoformat()
+        self._save_state(state)
+        print(f"Snapshot: exported papers {lo + 1}..{hi}, rewrote {len(parts)} changed partitions in {self.out_dir}")
+        return max(hi - lo, 0) + len(parts)
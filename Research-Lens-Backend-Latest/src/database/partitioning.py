@@ -0,0 +1,192 @@
+import re
+from datetime import date, datetime
+from sqlalchemy import text
+
+# monthly RANGE partitions on published_date, children are named <table>_yYYYYmMM
+TABLES = ["papers", "keywords", "key_findings"]
+PART_RE = re.compile(r'_y(\d{4})m(\d{2})$')
+ARCHIVE_SCHEMA = "archive"
+
+
+def month_start(d):
+    return date(d.year, d.month, 1)
+
+
+def add_months(d, n):
+    y, m = divmod(d.month - 1 + n, 12)
+    return date(d.year + y, m + 1, 1)
+
+
+def part_name(table, d):
+    return f"{table}_y{d.year}m{d.month:02d}"
+
+
+def is_partitioned(conn):
+    return bool(conn.execute(text("""
+        SELECT EXISTS (
+            SELECT 1 FROM pg_partitioned_table pt
+            JOIN pg_class c ON c.oid = pt.partrelid
+            WHERE c.relname = 'papers' AND pg_table_is_visible(c.oid)
+        )
+    """)).scalar())
+
+
+def create_month(conn, table, d, parent=None):
+    d = month_start(d)
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {part_name(table, d)} PARTITION OF {parent or table} "
+        f"FOR VALUES FROM ('{d}') TO ('{add_months(d, 1)}')"
+    ))
+
+
+def fill_paper_keys(conn):
+    # oldest row wins where the composite key already let duplicates in
+    conn.execute(text("""
+        INSERT INTO paper_keys (arxiv_id, paper_id, published_date)
+        SELECT DISTINCT ON (arxiv_id) arxiv_id, id, published_date
+        FROM papers ORDER BY arxiv_id, id
+        ON CONFLICT (arxiv_id) DO NOTHING
+    """))
+
+
+def ensure_partitions(engine, months=None, ahead=3):
+    """Create the monthly partitions for `months` plus the next `ahead` months.
+
+    Rows outside every partition land in <table>_default, creating a month
+    that already has rows there fails, so call this before inserting.
+    """
+    today = month_start(datetime.now())
+    wanted = {today} | {add_months(today, i) for i in range(1, ahead + 1)}
+    wanted |= {month_start(m) for m in (months or []) if m}
+    with engine.begin() as conn:
+        for table in TABLES:
+            for d in sorted(wanted):
+                create_month(conn, table, d)
+
+
+def migrate_to_partitioned(engine, ahead=3):
+    """Rebuild papers/keywords/key_findings as partitioned tables in one transaction.
+
+    Old tables are kept as *_legacy for a manual DROP once verified. Foreign
+    keys from other tables to papers(id) are dropped, a partitioned papers
+    only has the unique key (id, published_date); arxiv_id uniqueness moves
+    to paper_keys.
+    """
+    with engine.begin() as conn:
+        if is_partitioned(conn):
+            print("Already partitioned.")
+            return
+
+        conn.execute(text("UPDATE papers SET published_date = COALESCE(created_at, NOW()) WHERE published_date IS NULL"))
+        lo, hi = conn.execute(text("SELECT MIN(published_date), MAX(published_date) FROM papers")).one()
+
+        conn.execute(text("""
+            CREATE TABLE papers_p (LIKE papers INCLUDING DEFAULTS) PARTITION BY RANGE (published_date);
+            ALTER TABLE papers_p ALTER COLUMN published_date SET NOT NULL;
+            ALTER TABLE papers_p ADD PRIMARY KEY (id, published_date);
+            CREATE UNIQUE INDEX papers_p_arxiv_uq ON papers_p (arxiv_id, published_date);
+            CREATE INDEX papers_p_arxiv_id ON papers_p (arxiv_id);
+            CREATE INDEX papers_p_published_date ON papers_p (published_date);
+            CREATE INDEX papers_p_primary_category ON papers_p (primary_category);
+            CREATE INDEX papers_p_analysis_version ON papers_p (analysis_version);
+            CREATE INDEX papers_p_duplicate_of ON papers_p (duplicate_of);
+            CREATE INDEX papers_p_changed_at ON papers_p (changed_at);
+
+            CREATE TABLE keywords_p (LIKE keywords INCLUDING DEFAULTS) PARTITION BY RANGE (published_date);
+            ALTER TABLE keywords_p ALTER COLUMN published_date SET NOT NULL;
+            ALTER TABLE keywords_p ADD PRIMARY KEY (id, published_date);
+            CREATE INDEX keywords_p_keyword_date ON keywords_p (keyword, published_date);
+            CREATE INDEX keywords_p_paper_id ON keywords_p (paper_id);
+
+            CREATE TABLE key_findings_p (LIKE key_findings INCLUDING DEFAULTS) PARTITION BY RANGE (published_date);
+            ALTER TABLE key_findings_p ALTER COLUMN published_date SET NOT NULL;
+            ALTER TABLE key_findings_p ADD PRIMARY KEY (id, published_date);
+            CREATE INDEX key_findings_p_paper_id ON key_findings_p (paper_id);
+            CREATE INDEX key_findings_p_score ON key_findings_p (score);
+        """))
+
+        for table in TABLES:
+            conn.execute(text(f"CREATE TABLE {table}_default PARTITION OF {table}_p DEFAULT"))
+            if lo is not None:
+                d = month_start(lo)
+                while d <= month_start(hi):
+                    # named after the final table, the *_p parent gets renamed below
+                    create_month(conn, table, d, parent=f"{table}_p")
+                    d = add_months(d, 1)
+
+        conn.execute(text("INSERT INTO papers_p SELECT * FROM papers"))
+        conn.execute(text("""
+            INSERT INTO keywords_p (id, paper_id, keyword, frequency, analysis_version, published_date)
+            SELECT k.id, k.paper_id, k.keyword, k.frequency, k.analysis_version, p.published_date
+            FROM keywords k JOIN papers p ON p.id = k.paper_id
+        """))
+        conn.execute(text("""
+            INSERT INTO key_findings_p (id, paper_id, finding_text, finding_type, score, analysis_version, created_at, published_date)
+            SELECT f.id, f.paper_id, f.finding_text, f.finding_type, f.score, f.analysis_version, f.created_at, p.published_date
+            FROM key_findings f JOIN papers p ON p.id = f.paper_id
+        """))
+
+        conn.execute(text("""
+            ALTER TABLE keywords_p ADD FOREIGN KEY (paper_id, published_date)
+                REFERENCES papers_p (id, published_date) ON DELETE CASCADE;
+            ALTER TABLE key_findings_p ADD FOREIGN KEY (paper_id, published_date)
+                REFERENCES papers_p (id, published_date) ON DELETE CASCADE;
+        """))
+
+        # link tables can't reference papers(id) any more
+        fks = conn.execute(text("""
+            SELECT conrelid::regclass::text, conname FROM pg_constraint
+            WHERE contype = 'f' AND confrelid = 'papers'::regclass
+              AND conrelid NOT IN ('keywords'::regclass, 'key_findings'::regclass)
+        """)).all()
+        for tbl, name in fks:
+            conn.execute(text(f'ALTER TABLE {tbl} DROP CONSTRAINT "{name}"'))
+
+        for table in TABLES:
+            conn.execute(text(f"ALTER TABLE {table} RENAME TO {table}_legacy"))
+            conn.execute(text(f"ALTER TABLE {table}_p RENAME TO {table}"))
+            # keep the id sequence alive when the legacy table is dropped
+            conn.execute(text(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id"))
+
+        fill_paper_keys(conn)
+
+    ensure_partitions(engine, ahead=ahead)
+    print(f"Partitioned papers/keywords/key_findings ({lo} .. {hi}), old tables kept as *_legacy")
+
+
+def list_partitions(conn, table):
+    rows = conn.execute(text("""
+        SELECT c.relname FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = CAST(:t AS regclass)
+    """), {"t": table}).scalars().all()
+    out = []
+    for name in rows:
+        m = PART_RE.search(name)
+        if m:
+            out.append((date(int(m.group(1)), int(m.group(2)), 1), name))
+    return sorted(out)
+
+
+def archive_partitions(engine, keep_months=24):
+    """Detach months older than `keep_months` into the archive schema (still queryable there)."""
+    cutoff = add_months(month_start(datetime.now()), -keep_months)
+    moved = []
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+        # children first, their FKs would block detaching the papers month
+        for table in reversed(TABLES):
+            for d, name in list_partitions(conn, table):
+                if d >= cutoff:
+                    continue
+                conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+                fks = conn.execute(text("""
+                    SELECT conname FROM pg_constraint
+                    WHERE contype = 'f' AND conrelid = CAST(:t AS regclass)
+                """), {"t": name}).scalars().all()
+                for fk in fks:
+                    conn.execute(text(f'ALTER TABLE {name} DROP CONSTRAINT "{fk}"'))
+                conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+                moved.append(name)
+    print(f"Archived {len(moved)} partitions older than {cutoff}")
+    return moved
@@ -1,8 +1,78 @@
 # main.py
+import os
 import sys
+from datetime import datetime, timedelta
 from scraper.scraper import ArxivScraper
-from analysis.metadata_extractor import MetadataExtractor
+from analysis.metadata_extractor import MetadataExtractor, ANALYSIS_VERSION
+from analysis.dedup import DedupIndex
+from analysis.subscription_matcher import SubscriptionIndex
 from database.db_manager import DatabaseManager
+from database.parquet_export import ParquetExporter
+from database.events import publish_ingest, TRENDING_DAYS, TRENDING_TOP_N
+
+def ingest_papers(papers, db, extractor):
+    """Store a scraped batch: dedup, analysis, change events and snapshot."""
+    dedup = DedupIndex.load_or_build(db)
+    db.ensure_partitions([p['published_date'] for p in papers])
+
+    # remember the state before the batch so only changes get pushed
+    since = datetime.now()
+    prev_top = db.get_trending_topics(days=TRENDING_DAYS, top_n=TRENDING_TOP_N, primary=True)
+    pids = []
+    fresh = []
+    merged = flagged = 0
+
+    for i, paper in enumerate(papers):
+        if i % 50 == 0: print(f"   Processing {i}...")
+        
+        # 1. Clean
+        paper['abstract'] = extractor.clean_abstract(paper['abstract'])
+        text = f"{paper['title']} {paper['abstract']}"
+
+        # 2. Save Paper (new versions fold into the existing row)
+        dup, sig = dedup.check(paper['arxiv_id'], text)
+        if dup and dup['kind'] == 'version':
+            pid = dup['paper_id']
+            if not dup['newer']:
+                continue
+            db.merge_version(pid, paper)
+            dedup.add(pid, paper['arxiv_id'], sig)
+            merged += 1
+        else:
+            pid = db.insert_paper(paper)
+            of = dup['paper_id'] if dup else None
+            if of:
+                db.mark_duplicate(pid, of)
+                flagged += 1
+            dedup.add(pid, paper['arxiv_id'], sig, of)
+        pids.append(pid)
+
+        # 3. AI Analysis (Keywords/Findings), duplicates get none so trends aren't inflated
+        if dup and dup['kind'] == 'near_duplicate':
+            db.replace_analysis([(pid, [], None)], ANALYSIS_VERSION)
+            continue
+        kw = extractor.extract_keywords(text, top_n=10)
+        find = extractor.extract_key_findings(paper['abstract'])
+        
+        # replace instead of append so re-scrapes don't duplicate rows
+        db.replace_analysis([(pid, kw, find)], ANALYSIS_VERSION)
+        fresh.append(dict(paper, id=pid))
+
+    dedup.save()
+    print(f"   {merged} new versions merged, {flagged} near-duplicates flagged")
+
+    # all saved searches against the whole batch in one pass
+    subs = SubscriptionIndex(db.get_saved_searches())
+    rows = [{"user_id": srch['user_id'], "saved_search_id": srch['id'], "paper_id": p['id']}
+            for srch, p in subs.match(fresh)]
+    db.insert_notifications(rows)
+    print(f"   {len(rows)} saved-search matches")
+
+    publish_ingest(db, pids, since, prev_top)
+
+    # keep the analytics snapshot in step with the db
+    if os.getenv("SNAPSHOT_DIR"):
+        ParquetExporter(db).export()
 
 def initial_scrape():
     """Scrape strict date range requested"""
@@ -15,28 +85,48 @@ def initial_scrape():
     papers = scraper.scrape_date_range(start_date="2025-11-20", end_date="2025-11-23")
     
     print(f" Saving {len(papers)} papers to database...")
-    
-    for i, paper in enumerate(papers):
-        if i % 50 == 0: print(f"   Processing {i}...")
-        
-        # 1. Clean
-        paper['abstract'] = extractor.clean_abstract(paper['abstract'])
-        
-        # 2. Save Paper
-        pid = db.insert_paper(paper)
-        
-        # 3. AI Analysis (Keywords/Findings)
-        text = f"{paper['title']} {paper['abstract']}"
-        kw = extractor.extract_keywords(text, top_n=10)
-        find = extractor.extract_key_findings(paper['abstract'])
-        
-        db.insert_keywords(pid, kw)
-        db.insert_key_findings(pid, find)
+    ingest_papers(papers, db, extractor)
 
     print("Done!")
 
 if __name__ == '__main__':
     if len(sys.argv) > 1 and sys.argv[1] == 'init':
         initial_scrape()
+    elif len(sys.argv) > 1 and sys.argv[1] == 'reanalyze':
+        from tasks.reanalyze import reanalyze
+        v = int(sys.argv[2]) if len(sys.argv) > 2 else ANALYSIS_VERSION
+        reanalyze(version=v)
+    elif len(sys.argv) > 1 and sys.argv[1] == 'harvest':
+        # python main.py harvest [oai|api|html] [from] [until]
+        from scraper.sources import get_source
+        name = sys.argv[2] if len(sys.argv) > 2 else 'oai'
+        start = sys.argv[3] if len(sys.argv) > 3 else None
+        end = sys.argv[4] if len(sys.argv) > 4 else None
+        source = get_source(name)
+        stamp = None
+        if name == 'oai' and not start:
+            papers, stamp = source.fetch_incremental()
+        else:
+            # api/html need a window, default to the last day
+            start = start or (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+            papers = source.fetch(start, end or datetime.now().strftime("%Y-%m-%d"))
+        print(f" Saving {len(papers)} papers to database...")
+        ingest_papers(papers, DatabaseManager(), MetadataExtractor())
+        # only move the incremental watermark once the batch is stored
+        if stamp:
+            source.save_state(stamp)
+        print("Done!")
+    elif len(sys.argv) > 2 and sys.argv[1] == 'partition':
+        from database import partitioning
+        db = DatabaseManager()
+        if sys.argv[2] == 'migrate':
+            partitioning.migrate_to_partitioned(db.engine)
+        elif sys.argv[2] == 'ensure':
+            partitioning.ensure_partitions(db.engine)
+        elif sys.argv[2] == 'archive':
+            keep = int(sys.argv[3]) if len(sys.argv) > 3 else 24
+            partitioning.archive_partitions(db.engine, keep_months=keep)
+    elif len(sys.argv) > 1 and sys.argv[1] == 'export':
+        ParquetExporter(DatabaseManager()).export(full='--full' in sys.argv)
     else:
         pass
\ No newline at end of file
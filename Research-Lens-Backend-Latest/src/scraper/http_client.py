@@ -0,0 +1,243 @@
+import os
+import json
+import time
+import random
+import shutil
+import hashlib
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", ".http_cache")
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class HttpError(Exception):
+    pass
+
+
+class HttpResult:
+    def __init__(self, status_code, content, headers, from_cache=False):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.from_cache = from_cache
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+
+class HttpClient:
+    """Shared requests session with retries, politeness delay and an on-disk cache.
+
+    Cached entries are revalidated with ETag / Last-Modified; max_age lets a
+    caller skip the request entirely for pages that don't send validators.
+    """
+
+    def __init__(self, headers=None, cache_dir=HTTP_CACHE_DIR, max_retries=5, backoff=1.0,
+                 max_backoff=60, timeout=30, min_interval=0, pool_size=10):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update(headers or {})
+
+        self.cache_dir = cache_dir
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.min_interval = min_interval
+
+        self.timings = deque(maxlen=1000)
+        self._last_request = 0
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    # cache files
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode()).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + '.body', base + '.meta'
+
+    def _load_meta(self, url):
+        if not self.cache_dir:
+            return None
+        body, meta = self._paths(url)
+        if not (os.path.exists(body) and os.path.exists(meta)):
+            return None
+        with open(meta) as f:
+            return json.load(f)
+
+    def _store(self, url, resp, body_src=None):
+        body, meta = self._paths(url)
+        if body_src:
+            os.replace(body_src, body)
+        else:
+            with open(body + '.tmp', 'wb') as f:
+                f.write(resp.content)
+            os.replace(body + '.tmp', body)
+        with open(meta, 'w') as f:
+            json.dump({
+                "url": url,
+                "status": resp.status_code,
+                "etag": resp.headers.get('ETag'),
+                "last_modified": resp.headers.get('Last-Modified'),
+                "content_type": resp.headers.get('Content-Type'),
+                "stored_at": time.time()
+            }, f)
+
+    def _cached(self, url, meta):
+        body, _ = self._paths(url)
+        with open(body, 'rb') as f:
+            content = f.read()
+        return HttpResult(meta['status'], content, {"Content-Type": meta.get('content_type')}, from_cache=True)
+
+    # retries
+
+    def _retry_after(self, resp):
+        v = resp.headers.get('Retry-After')
+        if not v:
+            return None
+        try:
+            return min(float(v), self.max_backoff)
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(v)
+            return min(max((when - datetime.now(timezone.utc)).total_seconds(), 0), self.max_backoff)
+        except (TypeError, ValueError):
+            return None
+
+    def _sleep_backoff(self, attempt, resp=None):
+        wait = self._retry_after(resp) if resp is not None else None
+        if wait is None:
+            # full jitter
+            wait = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        time.sleep(wait)
+
+    def _throttle(self):
+        with self._lock:
+            wait = self._last_request + self.min_interval - time.time()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_request = time.time()
+
+    def _request(self, url, headers, stream=False):
+        err = None
+        for attempt in range(self.max_retries + 1):
+            self._throttle()
+            try:
+                resp = self.session.get(url, headers=headers, timeout=self.timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                err = e
+                resp = None
+            else:
+                if resp.status_code not in RETRY_STATUS:
+                    return resp, attempt + 1
+                err = HttpError(f"HTTP {resp.status_code} for {url}")
+                resp.close()
+
+            if attempt < self.max_retries:
+                self._sleep_backoff(attempt, resp)
+        raise HttpError(f"Giving up on {url} after {self.max_retries + 1} attempts: {err}")
+
+    def _record(self, url, status, t0, attempts, cache):
+        self.timings.append({
+            "url": url,
+            "status": status,
+            "elapsed": time.time() - t0,
+            "attempts": attempts,
+            "cache": cache
+        })
+
+    def get(self, url, params=None, max_age=0, cache=True):
+        url = requests.Request('GET', url, params=params).prepare().url
+        t0 = time.time()
+        meta = self._load_meta(url) if cache else None
+
+        if meta and time.time() - meta['stored_at'] < max_age:
+            self._record(url, meta['status'], t0, 0, "hit")
+            return self._cached(url, meta)
+
+        headers = {}
+        if meta and meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta and meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+        resp, attempts = self._request(url, headers)
+        if resp.status_code == 304 and meta:
+            self._record(url, 304, t0, attempts, "revalidated")
+            return self._cached(url, meta)
+
+        if cache and self.cache_dir and resp.status_code == 200:
+            self._store(url, resp)
+        self._record(url, resp.status_code, t0, attempts, "miss" if cache else "off")
+        return HttpResult(resp.status_code, resp.content, resp.headers)
+
+    def _place(self, src, dst):
+        # hardlink the cached body so a PDF isn't stored twice, copy across filesystems
+        tmp = dst + '.tmp'
+        try:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            os.link(src, tmp)
+            os.replace(tmp, dst)
+        except OSError:
+            shutil.copyfile(src, dst)
+
+    def download(self, url, save_path, chunk_size=64 * 1024):
+        """Stream url to save_path through the cache. False on a non-200 answer."""
+        t0 = time.time()
+        meta = self._load_meta(url)
+        headers = {}
+        if meta and meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta and meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+        resp, attempts = self._request(url, headers, stream=True)
+        try:
+            if resp.status_code == 304 and meta:
+                self._place(self._paths(url)[0], save_path)
+                self._record(url, 304, t0, attempts, "revalidated")
+                return True
+            if resp.status_code != 200:
+                self._record(url, resp.status_code, t0, attempts, "miss")
+                return False
+
+            target = self._paths(url)[0] + '.tmp' if self.cache_dir else save_path
+            with open(target, 'wb') as f:
+                for chunk in resp.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+            if self.cache_dir:
+                self._store(url, resp, body_src=target)
+                self._place(self._paths(url)[0], save_path)
+            self._record(url, 200, t0, attempts, "miss")
+            return True
+        finally:
+            resp.close()
+
+    def stats(self):
+        rows = list(self.timings)
+        if not rows:
+            return {"requests": 0}
+        by_cache = {}
+        for r in rows:
+            by_cache[r['cache']] = by_cache.get(r['cache'], 0) + 1
+        return {
+            "requests": len(rows),
+            "cache": by_cache,
+            "retries": sum(max(r['attempts'] - 1, 0) for r in rows),
+            "avg_elapsed": sum(r['elapsed'] for r in rows) / len(rows),
+            "max_elapsed": max(r['elapsed'] for r in rows)
+        }
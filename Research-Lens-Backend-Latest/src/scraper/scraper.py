@@ -1,8 +1,11 @@
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
-import time
 import re
+from scraper.http_client import HttpClient, HttpError
+
+# closed date windows rarely change, reuse cached search pages for a while
+SEARCH_MAX_AGE = 6 * 3600
 
 
 
@@ -12,6 +15,9 @@ class ArxivScraper:
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:145.0) Gecko/20100101 Firefox/145.0'#user agent setting
         }
+        # shared session: keep-alive, retries with backoff, on-disk cache
+        # min_interval replaces the old sleep so we still don't spam the arxiv server
+        self.http = HttpClient(headers=self.headers, min_interval=2)
 
 
 
@@ -20,6 +26,9 @@ class ArxivScraper:
     def scrape_date_range(self, start_date="2025-11-20", end_date="2025-11-23"):
         papers = []
         current_start = 0
+        # only a window that ended before today is closed, today's pages still grow
+        closed = datetime.strptime(end_date, "%Y-%m-%d").date() < datetime.now().date()
+        max_age = SEARCH_MAX_AGE if closed else 0
         page_size = 50 # arxiv has 50 pages per page in the advance search .that we are using 
 
         print("Starting Advanced Scrape: {start_date} to {end_date}") # just prints the search range
@@ -54,10 +63,8 @@ class ArxivScraper:
             try:
                 # page fetch
                 print(f"   Fetching results {current_start} - {current_start + page_size}...")
-                #just a delay to not spamm the arxiv server
-                time.sleep(2)
                 
-                resp = requests.get(self.base_url, params=base_params, headers=self.headers) #response  getting
+                resp = self.http.get(self.base_url, params=base_params, max_age=max_age) #response  getting
                 
                 if resp.status_code != 200:# ie, if not success
                     print(f"Error: Status {resp.status_code}")
@@ -155,20 +162,16 @@ class ArxivScraper:
                 break
         
         print(f"Total Papers Scraped: {len(papers)}")
+        print(f"HTTP: {self.http.stats()}")
         return papers
     
 
 
 
     def download_pdf(self, pdf_url, save_path):
-        #same download logic as before
+        # transient errors are retried by the client, only report what's left
         try:
-            r = requests.get(pdf_url, stream=True, timeout=30, headers=self.headers)
-            if r.status_code == 200:
-                with open(save_path, 'wb') as f:
-                    for chunk in r.iter_content(chunk_size=1024):
-                        f.write(chunk)
-                return True
+            return self.http.download(pdf_url, save_path)
+        except (HttpError, requests.RequestException, OSError) as e:
+            print(f"Download failed for {pdf_url}: {e}")
             return False
-        except:
-            return False
\ No newline at end of file
@@ -0,0 +1,222 @@
+import os
+import json
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+import xml.etree.ElementTree as ET
+
+from scraper.scraper import ArxivScraper
+from scraper.http_client import HttpClient
+
+OAI_URL = os.getenv("ARXIV_OAI_URL", "https://oaipmh.arxiv.org/oai")
+HARVEST_STATE = os.getenv("HARVEST_STATE_PATH", "harvest_state.json")
+
+NS = {
+    "oai": "http://www.openarchives.org/OAI/2.0/",
+    "arxiv": "http://arxiv.org/OAI/arXiv/",
+}
+
+
+def _squash(txt):
+    return " ".join((txt or "").split())
+
+
+def _date(txt):
+    return datetime.strptime(txt, "%Y-%m-%d") if txt else None
+
+
+class PaperSource(ABC):
+    """Something that yields paper dicts shaped like ArxivScraper.scrape_date_range output."""
+
+    name = None
+
+    @abstractmethod
+    def fetch(self, start_date, end_date):
+        ...
+
+
+class HtmlSearchSource(PaperSource):
+    """The advanced search HTML scraper, 50 results per page."""
+
+    name = "html"
+
+    def __init__(self):
+        self.scraper = ArxivScraper()
+
+    def fetch(self, start_date, end_date):
+        return self.scraper.scrape_date_range(start_date=start_date, end_date=end_date)
+
+
+class OaiPmhSource(PaperSource):
+    """Bulk harvest through arXiv's OAI-PMH endpoint (arXiv metadata format).
+
+    Pages hold up to a few thousand records and are chained with resumption
+    tokens; the endpoint answers 503 + Retry-After while it prepares them,
+    which the http client already waits out.
+    """
+
+    name = "oai"
+
+    def __init__(self, set_spec="cs", base_url=OAI_URL, state_path=HARVEST_STATE):
+        self.set_spec = set_spec
+        self.base_url = base_url
+        self.state_path = state_path
+        self.http = HttpClient(headers={'User-Agent': 'research-lens-harvester'}, cache_dir=None, min_interval=3)
+
+    def _parse(self, rec):
+        header = rec.find("oai:header", NS)
+        if header is None or header.get("status") == "deleted":
+            return None
+        meta = rec.find("oai:metadata/arxiv:arXiv", NS)
+        if meta is None:
+            return None
+
+        def val(tag):
+            el = meta.find(f"arxiv:{tag}", NS)
+            return el.text if el is not None else None
+
+        authors = []
+        for a in meta.findall("arxiv:authors/arxiv:author", NS):
+            parts = [a.findtext("arxiv:forenames", "", NS), a.findtext("arxiv:keyname", "", NS),
+                     a.findtext("arxiv:suffix", "", NS)]
+            authors.append(" ".join(p for p in parts if p))
+
+        arxiv_id = val("id")
+        cats = (val("categories") or "").split()
+        created = _date(val("created"))
+        return {
+            'arxiv_id': arxiv_id,
+            'title': _squash(val("title")),
+            'authors': authors,
+            'abstract': _squash(val("abstract")),
+            'categories': cats,
+            'primary_category': cats[0] if cats else "cs.AI",
+            'published_date': created,
+            'updated_date': _date(val("updated")) or created,
+            'pdf_url': f"https://arxiv.org/pdf/{arxiv_id}.pdf",
+            'comment': _squash(val("comments")) or None,
+            'scraped_at': datetime.now(),
+            # not part of the paper row, used for incremental harvesting
+            '_datestamp': header.findtext("oai:datestamp", None, NS)
+        }
+
+    def fetch(self, start_date=None, end_date=None):
+        params = {"verb": "ListRecords", "metadataPrefix": "arXiv", "set": self.set_spec}
+        if start_date:
+            params["from"] = start_date
+        if end_date:
+            params["until"] = end_date
+
+        papers = []
+        latest = None
+        complete = False
+        while True:
+            resp = self.http.get(self.base_url, params=params, cache=False)
+            if resp.status_code != 200:
+                print(f"Error: Status {resp.status_code}")
+                break
+
+            root = ET.fromstring(resp.content)
+            err = root.find("oai:error", NS)
+            if err is not None:
+                if err.get("code") == "noRecordsMatch":
+                    complete = True
+                else:
+                    print(f"OAI error {err.get('code')}: {err.text}")
+                break
+
+            for rec in root.findall("oai:ListRecords/oai:record", NS):
+                p = self._parse(rec)
+                if p:
+                    stamp = p.pop('_datestamp')
+                    latest = max(latest or stamp, stamp)
+                    papers.append(p)
+
+            token = root.find("oai:ListRecords/oai:resumptionToken", NS)
+            print(f"   Harvested {len(papers)} records...")
+            if token is None or not (token.text or "").strip():
+                complete = True
+                break
+            params = {"verb": "ListRecords", "resumptionToken": token.text.strip()}
+
+        # datestamps aren't ordered, a harvest cut short (e.g. badResumptionToken)
+        # must not move the watermark or the rest of the window is skipped for good
+        self.last_datestamp = latest if complete else None
+        if not complete:
+            print(f"Harvest incomplete, keeping the previous watermark ({len(papers)} records fetched)")
+        print(f"Total Papers Harvested: {len(papers)}")
+        return papers
+
+    def _load_state(self):
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path) as f:
+            return json.load(f)
+
+    def fetch_incremental(self):
+        """Harvest everything changed since the last run (from= is inclusive, upserts absorb the overlap).
+
+        Returns (papers, datestamp); pass the datestamp to save_state once the
+        papers are stored, a failed ingest then gets harvested again.
+        """
+        # first run: the last day, not the whole set
+        start = self._load_state().get(self.set_spec) or (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+        papers = self.fetch(start_date=start)
+        return papers, self.last_datestamp
+
+    def save_state(self, datestamp):
+        if not datestamp:
+            return
+        state = self._load_state()
+        state[self.set_spec] = datestamp
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.state_path)
+
+
+class ArxivApiSource(PaperSource):
+    """Atom API through the pinned `arxiv` package, up to 2000 results per page."""
+
+    name = "api"
+
+    def __init__(self, category="cs.*", page_size=2000):
+        import arxiv
+        self.arxiv = arxiv
+        self.category = category
+        self.client = arxiv.Client(page_size=page_size, delay_seconds=3, num_retries=5)
+
+    def fetch(self, start_date, end_date):
+        s = start_date.replace("-", "")
+        e = end_date.replace("-", "")
+        search = self.arxiv.Search(
+            query=f"cat:{self.category} AND submittedDate:[{s}0000 TO {e}2359]",
+            max_results=None,
+            sort_by=self.arxiv.SortCriterion.SubmittedDate
+        )
+
+        papers = []
+        for r in self.client.results(search):
+            papers.append({
+                'arxiv_id': r.get_short_id(),
+                'title': _squash(r.title),
+                'authors': [a.name for a in r.authors],
+                'abstract': _squash(r.summary),
+                'categories': r.categories,
+                'primary_category': r.primary_category,
+                'published_date': r.published.replace(tzinfo=None),
+                'updated_date': r.updated.replace(tzinfo=None),
+                'pdf_url': r.pdf_url,
+                'comment': r.comment,
+                'scraped_at': datetime.now()
+            })
+        print(f"Total Papers Fetched: {len(papers)}")
+        return papers
+
+
+SOURCES = {cls.name: cls for cls in (HtmlSearchSource, OaiPmhSource, ArxivApiSource)}
+
+
+def get_source(name, **kwargs):
+    if name not in SOURCES:
+        raise ValueError(f"Unknown source '{name}', expected one of {sorted(SOURCES)}")
+    return SOURCES[name](**kwargs)
@@ -0,0 +1,51 @@
+import os
+import sys
+import multiprocessing
+
+from gunicorn.app.base import BaseApplication
+
+API_WORKERS = int(os.getenv("API_WORKERS", str(multiprocessing.cpu_count())))
+API_PORT = int(os.getenv("API_PORT", "8000"))
+
+
+def post_fork(server, worker):
+    # the preloaded app opened pool connections in the master, a socket can't be shared across processes
+    import api
+    api.db.dispose_pools()
+
+
+class ApiServer(BaseApplication):
+    """Gunicorn master with uvicorn workers and the app imported once before forking.
+
+    Threads (event listener, trending sketch, analytics snapshot) start in
+    each worker's startup hook; one worker at a time builds the snapshot.
+    """
+
+    def __init__(self, options):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for k, v in self.options.items():
+            self.cfg.set(k, v)
+
+    def load(self):
+        import api
+        return api.app
+
+
+def run(workers=API_WORKERS, port=API_PORT):
+    ApiServer({
+        "bind": f"0.0.0.0:{port}",
+        "workers": workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "post_fork": post_fork,
+    }).run()
+
+
+if __name__ == '__main__':
+    # python serve.py [workers] [port]
+    w = int(sys.argv[1]) if len(sys.argv) > 1 else API_WORKERS
+    p = int(sys.argv[2]) if len(sys.argv) > 2 else API_PORT
+    run(workers=w, port=p)
@@ -0,0 +1,71 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from analysis.metadata_extractor import MetadataExtractor, ANALYSIS_VERSION
+from database.db_manager import DatabaseManager
+from database.events import publish, IDS_PER_EVENT
+
+# one extractor (spacy model) per worker process
+_extractor = None
+
+
+def _init_worker():
+    global _extractor
+    _extractor = MetadataExtractor()
+
+
+def analyze_chunk(rows, top_n=10):
+    # flagged near-duplicates keep no keyword/finding rows, only their version is bumped
+    dups = [r for r in rows if r.get('duplicate_of')]
+    rows = [r for r in rows if not r.get('duplicate_of')]
+    texts = [f"{r['title']} {r['abstract'] or ''}" for r in rows]
+    kws = _extractor.extract_keywords_batch(texts, top_n=top_n)
+    finds = _extractor.extract_key_findings_batch([r['abstract'] or '' for r in rows])
+    return [(r['id'], kw, f) for r, kw, f in zip(rows, kws, finds)] + [(r['id'], [], None) for r in dups]
+
+
+def reanalyze(version=ANALYSIS_VERSION, chunk_size=500, workers=None):
+    """Recompute keywords/findings for every paper below `version`.
+
+    Each chunk is swapped in its own transaction and stamps
+    papers.analysis_version, so a killed run just picks up where it stopped.
+    """
+    db = DatabaseManager()
+    workers = workers or os.cpu_count() or 1
+    total = db.count_stale_papers(version)
+    print(f"Re-analyzing {total} papers to version {version} ({workers} workers)...")
+
+    done = 0
+    t0 = time.time()
+
+    def flush(futs):
+        nonlocal done
+        for fut in futs:
+            res = fut.result()
+            db.replace_analysis(res, version)
+            # drop cached paper details in the api
+            ids = [pid for pid, _, _ in res]
+            for i in range(0, len(ids), IDS_PER_EVENT):
+                publish(db, "papers", {"ids": ids[i:i + IDS_PER_EVENT]})
+            done += len(res)
+        rate = done / max(time.time() - t0, 1e-9)
+        print(f"   {done}/{total} papers, {rate:.1f} papers/s")
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending = set()
+        for chunk in db.stream_stale_papers(version, chunk_size=chunk_size):
+            pending.add(pool.submit(analyze_chunk, chunk))
+            # keep memory bounded, don't read the whole table ahead
+            if len(pending) >= workers * 2:
+                fin, pending = wait(pending, return_when=FIRST_COMPLETED)
+                flush(fin)
+        if pending:
+            flush(pending)
+
+    # keyword rows changed under the trending sketch, have the api reload it
+    publish(db, "keywords_replaced", {"papers": done})
+
+    elapsed = time.time() - t0
+    print(f"Done! {done} papers in {elapsed:.1f}s")
+    return done
@@ -0,0 +1,108 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scraper.http_client import HttpClient, HttpError
+
+PDF = b"%PDF-1.4 " + b"x" * 4096
+
+
+class MockArxiv(BaseHTTPRequestHandler):
+    # per-path queue of statuses to answer before the normal response
+    failures = {}
+    hits = []
+
+    def do_GET(self):
+        self.hits.append((self.path, self.headers.get("If-None-Match")))
+        queued = self.failures.get(self.path)
+        if queued:
+            status, retry_after = queued.pop(0)
+            self.send_response(status)
+            if retry_after is not None:
+                self.send_header("Retry-After", retry_after)
+            self.end_headers()
+            return
+
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = PDF if self.path.endswith(".pdf") else b"<html>results</html>"
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    MockArxiv.failures = {}
+    MockArxiv.hits = []
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), MockArxiv)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_port}"
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def client(tmp_path):
+    return HttpClient(cache_dir=str(tmp_path / "cache"), max_retries=2, backoff=0.01)
+
+
+def test_retries_honour_retry_after(server, client):
+    MockArxiv.failures["/search"] = [(503, "0"), (429, "0")]
+
+    resp = client.get(f"{server}/search")
+
+    assert resp.status_code == 200
+    assert len(MockArxiv.hits) == 3
+    assert client.stats()["retries"] == 2
+
+
+def test_gives_up_after_max_retries(server, client):
+    MockArxiv.failures["/search"] = [(503, "0")] * 3
+
+    with pytest.raises(HttpError):
+        client.get(f"{server}/search")
+    assert len(MockArxiv.hits) == 3
+
+
+def test_cached_page_is_revalidated_with_etag(server, client):
+    first = client.get(f"{server}/search")
+    second = client.get(f"{server}/search")
+
+    assert not first.from_cache
+    assert second.from_cache and second.content == first.content
+    assert MockArxiv.hits[-1] == ("/search", '"v1"')
+    assert [r["cache"] for r in client.timings] == ["miss", "revalidated"]
+
+
+def test_max_age_skips_the_request(server, client):
+    client.get(f"{server}/search")
+    resp = client.get(f"{server}/search", max_age=60)
+
+    assert resp.from_cache
+    assert len(MockArxiv.hits) == 1
+
+
+def test_download_hardlinks_the_cached_body(server, client, tmp_path):
+    target = tmp_path / "paper.pdf"
+
+    assert client.download(f"{server}/paper.pdf", str(target))
+    cached = client._paths(f"{server}/paper.pdf")[0]
+    assert target.read_bytes() == PDF
+    assert os.path.samefile(cached, target)
+
+    # a second download revalidates and links again instead of copying
+    target.unlink()
+    assert client.download(f"{server}/paper.pdf", str(target))
+    assert MockArxiv.hits[-1] == ("/paper.pdf", '"v1"')
+    assert os.path.samefile(cached, target)
@@ -25,6 +25,32 @@ export default function Dashboard() {
       }
     };
     loadData();
+
+    // live updates pushed by the api instead of refetching
+    const stream = new EventSource('http://localhost:8000/api/stream');
+
+    stream.addEventListener('finding', (e) => {
+      const item = JSON.parse(e.data);
+      setList(prev => [item, ...prev.filter(x => x.id !== item.id)].slice(0, 10));
+    });
+
+    stream.addEventListener('stats', (e) => {
+      const inc = JSON.parse(e.data);
+      const keys = { 'RECENT INFLUX': 'recent', 'PAPERS PARSED': 'papers', 'HIGH IMPACT': 'high_impact' };
+      setMetrics(prev => prev.map(m => {
+        const n = inc[keys[m.label]];
+        if (!n) return m;
+        const curr = parseInt(String(m.value).replace('+', ''), 10) || 0;
+        const val = String(m.value).startsWith('+') ? `+${curr + n}` : `${curr + n}`;
+        return { ...m, value: val };
+      }));
+    });
+
+    stream.addEventListener('trending', (e) => {
+      setTags(JSON.parse(e.data));
+    });
+
+    return () => stream.close();
   }, []);
 
   return (